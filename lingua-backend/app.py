@@ -1,17 +1,17 @@
 import io
 import os
 import uuid
+from contextlib import asynccontextmanager
 from typing import Optional
 
-import aiofiles
 import aiosqlite
 
 # import motor.motor_asyncio
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, Form, UploadFile
+from fastapi import FastAPI, File, Form, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from lingua.agents.LinguaAgent import LinguaGen
+from lingua.utils.audio_store import AudioStore
 from lingua.utils.dataclass import audio2text, text2audio
 
 load_dotenv()
@@ -22,8 +22,18 @@ load_dotenv()
 # conversations_collection = db.get_collection(os.getenv("MONGO_DB_COLLECTION"))
 
 
+audio_store = AudioStore.from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audio_store.start()
+    yield
+    await audio_store.stop()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -37,8 +47,6 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-app.mount("/data", StaticFiles(directory="data/"), name="data")
-
 SQL_DATABASE_URL = os.getenv("SQL_DATABASE_URL")
 
 
@@ -73,6 +81,11 @@ async def get_conversation(conversation_id):
         return row[0] if row else None
 
 
+@app.api_route("/data/{key}", methods=["GET", "HEAD"])
+async def get_audio(key: str, request: Request):
+    return await audio_store.serve(key, request)
+
+
 @app.get("/new_conversation")
 async def new_conversation():
     conversation_id = uuid.uuid4().hex
@@ -144,9 +157,8 @@ async def compute_reply(
         model="tts-1",
     )
 
-    file_name = f"data/{conversation_id}_output.mp3"
-    async with aiofiles.open(file_name, "wb") as audio_file:
-        await audio_file.write(response)
+    key = await audio_store.put(response, prefix=conversation_id)
+    file_name = f"data/{key}"
 
     # await update_or_create_conversation(conversation_id, conversation)
     await update_conversation(conversation_id, str(conversation))
@@ -0,0 +1,310 @@
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+\.mp3$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+TMP_SUFFIX = ".tmp"
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class AudioEntry:
+    """Size and creation time of a stored audio file."""
+
+    size: int
+    created_at: float
+
+
+@dataclass
+class AudioStore:
+    """Stores generated audio on disk under unique keys, bounded by a TTL and a size budget.
+
+    Files are written to a temporary name and atomically renamed into place, so
+    readers never see a partially written file. An in-memory index tracks the
+    total number of bytes so eviction does not need to rescan the directory.
+
+    The index is kept per process. When several workers share the directory,
+    each one enforces the size budget against the files it knows about.
+    """
+
+    directory: str = "data"
+    ttl_seconds: float = 60 * 60
+    max_bytes: int = 500 * 1024 * 1024
+    eviction_interval_seconds: float = 60
+
+    entries: Dict[str, AudioEntry] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    total_bytes: int = field(init=False, repr=False, default=0)
+    _lock: asyncio.Lock = field(
+        init=False, repr=False, default_factory=asyncio.Lock
+    )
+    _eviction_task: Optional[asyncio.Task] = field(
+        init=False, repr=False, default=None
+    )
+
+    @classmethod
+    def from_env(cls):
+        """Build a store from the AUDIO_STORE_* environment variables.
+
+        Empty values are treated as unset.
+        """
+        return cls(
+            directory=os.getenv("AUDIO_STORE_DIR") or "data",
+            ttl_seconds=float(os.getenv("AUDIO_STORE_TTL_SECONDS") or 3600),
+            max_bytes=int(os.getenv("AUDIO_STORE_MAX_BYTES") or 524288000),
+            eviction_interval_seconds=float(
+                os.getenv("AUDIO_STORE_EVICTION_INTERVAL_SECONDS") or 60
+            ),
+        )
+
+    def path_for(self, key: str):
+        """Return the file path for a key, or None if the key is not valid."""
+        if not KEY_PATTERN.match(key):
+            return None
+        return os.path.join(self.directory, key)
+
+    def load(self):
+        """Rebuild the index from the files already on disk and drop stale temp files.
+
+        Temp files younger than one eviction interval may belong to a write in
+        progress in another worker, so they are left alone.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.entries.clear()
+        self.total_bytes = 0
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(TMP_SUFFIX):
+                age = now - entry.stat().st_mtime
+                if age > self.eviction_interval_seconds:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+                continue
+            if not KEY_PATTERN.match(entry.name):
+                continue
+            stat = entry.stat()
+            self.entries[entry.name] = AudioEntry(
+                size=stat.st_size, created_at=stat.st_mtime
+            )
+            self.total_bytes += stat.st_size
+
+    async def put(self, data: bytes, prefix: str = ""):
+        """Write audio under a new unique key and return the key."""
+        prefix = re.sub(r"[^A-Za-z0-9-]", "", prefix)
+        key = (
+            f"{prefix}_{uuid.uuid4().hex}.mp3"
+            if prefix
+            else f"{uuid.uuid4().hex}.mp3"
+        )
+        path = os.path.join(self.directory, key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}{TMP_SUFFIX}"
+        try:
+            async with aiofiles.open(tmp_path, "wb") as audio_file:
+                await audio_file.write(data)
+            await aiofiles.os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if len(data) > self.max_bytes:
+            logging.warning(
+                f"Audio file {key} ({len(data)} bytes) exceeds the store budget of {self.max_bytes} bytes"
+            )
+
+        async with self._lock:
+            self.entries[key] = AudioEntry(
+                size=len(data), created_at=time.time()
+            )
+            self.total_bytes += len(data)
+            over_budget = self.total_bytes > self.max_bytes
+        if over_budget:
+            # Never evict the file the caller is about to hand out
+            await self.evict(keep=key)
+        return key
+
+    async def evict(self, keep: Optional[str] = None):
+        """Remove expired files, then the oldest files until the store fits its size budget.
+
+        The `keep` key is exempt from size eviction. Files that cannot be removed
+        stay in the index so a later pass can retry them.
+        """
+        now = time.time()
+        async with self._lock:
+            victims = []
+            remaining_bytes = self.total_bytes
+            for key, entry in sorted(
+                self.entries.items(), key=lambda item: item[1].created_at
+            ):
+                expired = now - entry.created_at > self.ttl_seconds
+                if not expired and remaining_bytes <= self.max_bytes:
+                    break
+                if not expired and key == keep:
+                    continue
+                victims.append(key)
+                remaining_bytes -= entry.size
+
+        evicted = []
+        for key in victims:
+            try:
+                await aiofiles.os.remove(os.path.join(self.directory, key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(
+                    f"Could not evict audio file {key} with Exception {e}"
+                )
+                continue
+            evicted.append(key)
+
+        async with self._lock:
+            for key in evicted:
+                entry = self.entries.pop(key, None)
+                if entry is not None:
+                    self.total_bytes -= entry.size
+        if evicted:
+            logging.info(
+                f"Evicted {len(evicted)} audio files, {self.total_bytes} bytes remaining"
+            )
+        return len(evicted)
+
+    async def _eviction_loop(self):
+        while True:
+            await asyncio.sleep(self.eviction_interval_seconds)
+            try:
+                await self.evict()
+            except Exception as e:
+                logging.warning(f"Audio eviction failed with Exception {e}")
+
+    def start(self):
+        """Load the index and start the background eviction task."""
+        self.load()
+        self._eviction_task = asyncio.create_task(self._eviction_loop())
+
+    async def stop(self):
+        """Cancel the background eviction task."""
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+            self._eviction_task = None
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, mtime: int):
+        """Evaluate If-None-Match, or If-Modified-Since when it is absent."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if tag.startswith("W/"):
+                    tag = tag[2:]
+                if tag == "*" or tag == etag:
+                    return True
+            return False
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return mtime <= int(since.timestamp())
+        return False
+
+    async def serve(self, key: str, request: Request):
+        """Serve a stored file with caching headers and single byte-range support."""
+        path = self.path_for(key)
+        if path is None:
+            return Response(status_code=404)
+        try:
+            # Open before building the response; on POSIX an open handle
+            # keeps the data readable even if eviction unlinks the file
+            audio_file = await aiofiles.open(path, "rb")
+        except FileNotFoundError:
+            return Response(status_code=404)
+
+        stat = os.fstat(audio_file.fileno())
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            # Keys are never reused, so the content behind a URL never changes
+            "Cache-Control": f"public, max-age={int(self.ttl_seconds)}, immutable",
+        }
+
+        if self._not_modified(request, etag, int(stat.st_mtime)):
+            await audio_file.close()
+            return Response(status_code=304, headers=headers)
+
+        start, end = 0, size - 1
+        status_code = 200
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (if_range is None or if_range == etag):
+            match = RANGE_PATTERN.match(range_header.strip())
+            # Multi-range and malformed requests fall back to the full file
+            if match and (match[1] or match[2]):
+                first = int(match[1]) if match[1] else size - int(match[2])
+                first = max(first, 0)
+                # A last byte before the first byte makes the header invalid,
+                # so it is ignored rather than answered with 416
+                valid = not (match[1] and match[2]) or int(match[2]) >= first
+                if valid and first >= size:
+                    await audio_file.close()
+                    headers["Content-Range"] = f"bytes */{size}"
+                    return Response(status_code=416, headers=headers)
+                if valid:
+                    last = int(match[2]) if match[1] and match[2] else size
+                    start, end = first, min(last, size - 1)
+                    status_code = 206
+                    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        headers["Content-Length"] = str(end - start + 1)
+        if request.method == "HEAD":
+            await audio_file.close()
+            return Response(
+                status_code=status_code,
+                headers=headers,
+                media_type="audio/mpeg",
+            )
+
+        async def read_range():
+            try:
+                await audio_file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await audio_file.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+            finally:
+                await audio_file.close()
+
+        return StreamingResponse(
+            read_range(),
+            status_code=status_code,
+            headers=headers,
+            media_type="audio/mpeg",
+        )
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import time
+from email.utils import formatdate
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from lingua.utils.audio_store import AudioStore
+
+DATA = b"0123456789"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AudioStore(directory=str(tmp_path), max_bytes=25)
+    store.load()
+    return store
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+
+    @app.api_route("/data/{key}", methods=["GET", "HEAD"])
+    async def get_audio(key: str, request: Request):
+        return await store.serve(key, request)
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def key(store):
+    return asyncio.run(store.put(DATA, prefix="conversation"))
+
+
+@pytest.mark.parametrize(
+    "range_header, content, content_range",
+    [
+        ("bytes=2-4", b"234", "bytes 2-4/10"),
+        ("bytes=7-", b"789", "bytes 7-9/10"),
+        ("bytes=-3", b"789", "bytes 7-9/10"),
+        ("bytes=8-50", b"89", "bytes 8-9/10"),
+    ],
+)
+def test_range_request(client, key, range_header, content, content_range):
+    response = client.get(f"/data/{key}", headers={"Range": range_header})
+    assert response.status_code == 206
+    assert response.content == content
+    assert response.headers["content-range"] == content_range
+    assert response.headers["content-length"] == str(len(content))
+
+
+@pytest.mark.parametrize("range_header", ["bytes=10-", "bytes=10-20"])
+def test_unsatisfiable_range(client, key, range_header):
+    response = client.get(f"/data/{key}", headers={"Range": range_header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=5-2", "bytes=0-1,4-5"])
+def test_invalid_range_returns_full_file(client, key, range_header):
+    response = client.get(f"/data/{key}", headers={"Range": range_header})
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert "content-range" not in response.headers
+
+
+def test_if_range_mismatch_returns_full_file(client, key):
+    response = client.get(
+        f"/data/{key}",
+        headers={"Range": "bytes=2-4", "If-Range": '"stale"'},
+    )
+    assert response.status_code == 200
+    assert response.content == DATA
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{etag}", "W/{etag}", 'W/"other", {etag}', '"other",W/{etag}', "*"],
+)
+def test_if_none_match(client, key, if_none_match):
+    etag = client.get(f"/data/{key}").headers["etag"]
+    response = client.get(
+        f"/data/{key}",
+        headers={"If-None-Match": if_none_match.format(etag=etag)},
+    )
+    assert response.status_code == 304
+
+
+def test_if_none_match_mismatch(client, key):
+    response = client.get(
+        f"/data/{key}",
+        headers={
+            "If-None-Match": '"other"',
+            "If-Modified-Since": formatdate(time.time() + 60, usegmt=True),
+        },
+    )
+    assert response.status_code == 200
+    assert response.content == DATA
+
+
+def test_if_modified_since(client, key):
+    last_modified = client.get(f"/data/{key}").headers["last-modified"]
+    response = client.get(
+        f"/data/{key}", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    response = client.get(
+        f"/data/{key}",
+        headers={"If-Modified-Since": formatdate(0, usegmt=True)},
+    )
+    assert response.status_code == 200
+
+
+def test_head(client, key):
+    response = client.head(f"/data/{key}")
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(DATA))
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_invalid_key(client):
+    assert client.get("/data/..%2Fapp.py").status_code == 404
+    assert client.get("/data/missing.mp3").status_code == 404
+
+
+def test_ttl_eviction(store):
+    old = asyncio.run(store.put(DATA))
+    new = asyncio.run(store.put(DATA))
+    store.entries[old].created_at = time.time() - store.ttl_seconds - 1
+
+    assert asyncio.run(store.evict()) == 1
+    assert list(store.entries) == [new]
+    assert store.total_bytes == len(DATA)
+    assert not os.path.exists(store.path_for(old))
+
+
+def test_budget_eviction_is_oldest_first(store):
+    keys = [asyncio.run(store.put(DATA)) for _ in range(3)]
+
+    assert list(store.entries) == keys[1:]
+    assert store.total_bytes == 2 * len(DATA)
+    assert not os.path.exists(store.path_for(keys[0]))
+
+
+def test_oversized_put_keeps_new_key(store, client):
+    key = asyncio.run(store.put(b"z" * 30))
+
+    assert list(store.entries) == [key]
+    assert client.get(f"/data/{key}").status_code == 200
+
+
+def test_failed_removal_stays_indexed(store, monkeypatch):
+    key = asyncio.run(store.put(DATA))
+    store.entries[key].created_at = 0
+
+    async def fail_remove(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr("aiofiles.os.remove", fail_remove)
+    assert asyncio.run(store.evict()) == 0
+    assert key in store.entries
+    assert store.total_bytes == len(DATA)
+
+
+def test_load_rebuilds_index(store, tmp_path):
+    keys = [asyncio.run(store.put(DATA)) for _ in range(2)]
+    leftover = tmp_path / f"{keys[0]}.abc.tmp"
+    leftover.write_bytes(DATA)
+    stale = time.time() - store.eviction_interval_seconds - 1
+    os.utime(leftover, (stale, stale))
+    in_progress = tmp_path / f"{keys[1]}.def.tmp"
+    in_progress.write_bytes(DATA)
+
+    reloaded = AudioStore(directory=str(tmp_path))
+    reloaded.load()
+
+    assert sorted(reloaded.entries) == sorted(keys)
+    assert reloaded.total_bytes == 2 * len(DATA)
+    assert not leftover.exists()
+    assert in_progress.exists()
+
+
+def test_from_env_treats_empty_values_as_unset(monkeypatch):
+    monkeypatch.setenv("AUDIO_STORE_DIR", "")
+    monkeypatch.setenv("AUDIO_STORE_TTL_SECONDS", "")
+    monkeypatch.setenv("AUDIO_STORE_MAX_BYTES", "")
+    monkeypatch.setenv("AUDIO_STORE_EVICTION_INTERVAL_SECONDS", "")
+
+    store = AudioStore.from_env()
+    assert store.directory == "data"
+    assert store.ttl_seconds == 3600
+    assert store.max_bytes == 524288000
+    assert store.eviction_interval_seconds == 60